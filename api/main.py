@@ -2,6 +2,7 @@ import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from services.chat import router as chat_router
 from services.search import router as search_router
@@ -26,10 +27,38 @@ async def lifespan(app: FastAPI):
         logger.info("Database initialized successfully")
     except Exception as e:
         logger.warning(f"DB init deferred (will retry on first request): {e}")
+
+    # Pre-warm expensive singletons so the first request doesn't pay for them:
+    # tokenizer BPE load, OpenAI client TLS setup, and one pooled DB connection.
+    try:
+        from services.chat import _enc
+        _enc("gpt-4o-mini")
+    except Exception as e:
+        logger.warning(f"tiktoken warm-up skipped: {e}")
+    try:
+        from core.settings import settings
+        if settings.openai_api_key:
+            from services.embeddings import _get_client
+            _get_client()
+    except Exception as e:
+        logger.warning(f"OpenAI client warm-up skipped: {e}")
+    try:
+        from sqlalchemy import text
+        from core.database import engine
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except Exception as e:
+        logger.warning(f"DB pool warm-up skipped: {e}")
+
     yield
 
 
-app = FastAPI(title="Context API", version="0.1.0", lifespan=lifespan)
+app = FastAPI(
+    title="Context API",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 
 @app.get("/health")
@@ -0,0 +1,24 @@
+"""Optional Redis client for cross-process/restart caches.
+
+Returns None when REDIS_URL isn't configured (or the redis package is
+missing), so callers degrade gracefully to their in-process tiers.
+"""
+
+from core.settings import settings
+
+_redis = None
+_unavailable = False
+
+
+def get_redis():
+    global _redis, _unavailable
+    if _unavailable or not settings.redis_url:
+        return None
+    if _redis is None:
+        try:
+            import redis.asyncio as aioredis  # type: ignore
+        except Exception:
+            _unavailable = True
+            return None
+        _redis = aioredis.from_url(settings.redis_url)
+    return _redis
@@ -1,22 +1,85 @@
+from pgvector.asyncpg import register_vector
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from core.settings import settings
 
-engine = create_async_engine(settings.async_database_url, echo=False, pool_size=10, max_overflow=20)
+engine = create_async_engine(
+    settings.async_database_url,
+    echo=False,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_pre_ping=True,
+    pool_recycle=settings.db_pool_recycle,
+    # Room for every statement shape the routers emit (the default 500 churns
+    # once the per-model retrieval variants are in play).
+    query_cache_size=1200,
+)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
+async def _try_register_vector(connection):
+    """Register pgvector's binary asyncpg codec so ndarray embeddings are sent
+    as raw float bytes instead of text literals.
+
+    On a fresh database the vector type doesn't exist until init_db has run
+    CREATE EXTENSION, and asyncpg raises for the unknown type. Skip quietly in
+    that case — init_db re-registers on its bootstrap connection once the
+    extension is in place, and every later connection registers normally.
+    """
+    try:
+        await register_vector(connection)
+    except ValueError as exc:
+        if not str(exc).startswith("unknown type:"):
+            raise
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _register_vector_codec(dbapi_connection, connection_record):
+    dbapi_connection.run_async(_try_register_vector)
+
+
 async def get_db() -> AsyncSession:
     async with async_session() as session:
         yield session
 
 
+async def set_ef_search(session: AsyncSession, k: int) -> None:
+    """Widen the HNSW search beam for the current transaction.
+
+    Scales with the requested k so recall holds up for large result sets;
+    SET LOCAL resets at commit. (SET takes no bind parameters, hence the
+    int-coerced literal.)
+    """
+    await session.execute(text(f"SET LOCAL hnsw.ef_search = {max(40, int(k) * 10)}"))
+
+
 async def init_db():
-    """Create extension + tables on startup."""
+    """Create extension + tables on startup.
+
+    DDL is gated behind a transaction-scoped advisory lock so only one worker
+    runs it per deploy — the lock releases itself at commit OR rollback, so a
+    failed create_all can't leak it back into the pool. The extension DDL
+    (which takes an exclusive lock) is skipped entirely when pg_extension
+    already lists vector — the warm-start common case.
+    """
     async with engine.begin() as conn:
-        await conn.execute(
-            __import__("sqlalchemy").text("CREATE EXTENSION IF NOT EXISTS vector")
-        )
+        got_lock = (
+            await conn.execute(text("SELECT pg_try_advisory_xact_lock(847291)"))
+        ).scalar()
+        if not got_lock:
+            # Another worker is running DDL; nothing for us to do.
+            return
+        exists = (
+            await conn.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'vector'"))
+        ).scalar()
+        if not exists:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+            # The connect-time registration skipped this connection (the
+            # type didn't exist yet); patch it up before it rejoins the pool.
+            raw = await conn.get_raw_connection()
+            await register_vector(raw.driver_connection)
         from models.base import Base
 
         await conn.run_sync(Base.metadata.create_all)
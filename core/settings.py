@@ -18,10 +18,26 @@ class Settings(BaseSettings):
     )
     database_public_url: str | None = None  # Railway may set this too
 
+    # Connection pool. Keep pool_size + max_overflow (× workers) below the
+    # Postgres max_connections limit.
+    db_pool_size: int = 20
+    db_max_overflow: int = 30
+    db_pool_timeout: int = 5
+    db_pool_recycle: int = 1800
+
     # Embeddings
     openai_api_key: str | None = None
     embedding_model: str = "text-embedding-3-small"
 
+    # Max simultaneous chat-completion calls per worker (parallel map steps
+    # fan out through this gate so bursts stay under provider rate limits)
+    llm_concurrency: int = 8
+
+    # Optional Redis tier for cross-process caches (embeddings survive worker
+    # restarts and are shared across uvicorn workers)
+    redis_url: str | None = None
+    embedding_cache_ttl: int = 30 * 86400  # seconds
+
     # Auth (optional shared secret)
     atlas_api_key: str | None = None
 
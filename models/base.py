@@ -1,5 +1,38 @@
+import os
+import time
+
+from pgvector.sqlalchemy import HALFVEC
 from sqlalchemy.orm import DeclarativeBase
 
 
 class Base(DeclarativeBase):
     pass
+
+
+class HalfVec(HALFVEC):
+    """HALFVEC whose binds pass through to the driver untouched.
+
+    The stock type renders every bound vector to its text form ('[0.1,...]'),
+    but the binary asyncpg codec registered on connect encodes ndarrays/lists
+    itself — and raises on strings. Dropping the bind processor hands the raw
+    value to the codec, so embeddings actually travel the wire in binary.
+    Result decoding is unchanged: HalfVector._from_db accepts what the codec's
+    decoder yields.
+    """
+
+    cache_ok = True
+
+    def bind_processor(self, dialect):
+        return None
+
+
+_ULID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+
+def generate_ulid() -> str:
+    """Return a 26-char Crockford-base32 ULID (48-bit timestamp + 80-bit random).
+
+    Lexicographically sortable, so string primary keys cluster by creation time.
+    """
+    value = (int(time.time() * 1000) << 80) | int.from_bytes(os.urandom(10), "big")
+    return "".join(_ULID_ALPHABET[(value >> shift) & 0x1F] for shift in range(125, -1, -5))
@@ -2,12 +2,11 @@
 import uuid
 from datetime import datetime
 
-from pgvector.sqlalchemy import Vector
-from sqlalchemy import DateTime, ForeignKey, Index, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from models.base import Base
+from models.base import Base, HalfVec
 
 
 class Conversation(Base):
@@ -17,13 +16,35 @@ class Conversation(Base):
     project: Mapped[str | None] = mapped_column(String(255), index=True)
     title: Mapped[str | None] = mapped_column(String(500))
     summary: Mapped[str | None] = mapped_column(Text)
-    summary_embedding = mapped_column(Vector(1536), nullable=True)
+    summary_embedding = mapped_column(HalfVec(1536), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
-    messages: Mapped[list["Message"]] = relationship(back_populates="conversation", cascade="all, delete-orphan")
+    # lazy="raise_on_sql" turns any accidental N+1 lazy load into an error;
+    # readers opt in explicitly with selectinload.
+    messages: Mapped[list["Message"]] = relationship(
+        back_populates="conversation",
+        cascade="all, delete-orphan",
+        order_by="Message.created_at",
+        lazy="raise_on_sql",
+    )
+
+    __table_args__ = (
+        # Covering index for the message->conversation project-lookup join:
+        # lets the planner answer (id -> project) with an index-only scan
+        # instead of a heap fetch per joined message row.
+        Index("ix_conversations_id_project", "id", postgresql_include=["project"]),
+        Index(
+            "ix_conversations_summary_embedding",
+            "summary_embedding",
+            postgresql_using="hnsw",
+            postgresql_ops={"summary_embedding": "halfvec_l2_ops"},
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_where=text("summary_embedding IS NOT NULL"),
+        ),
+    )
 
 
 class Message(Base):
@@ -31,18 +52,32 @@ class Message(Base):
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     conversation_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("conversations.id", ondelete="CASCADE"), index=True
+        UUID(as_uuid=True), ForeignKey("conversations.id", ondelete="CASCADE")
     )
     role: Mapped[str] = mapped_column(String(20))  # user | assistant | system
     content: Mapped[str] = mapped_column(Text)
-    embedding = mapped_column(Vector(1536), nullable=True)
+    embedding = mapped_column(HalfVec(1536), nullable=True)
     token_count: Mapped[int | None] = mapped_column()
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
-    conversation: Mapped[Conversation] = relationship(back_populates="messages")
+    conversation: Mapped[Conversation] = relationship(back_populates="messages", lazy="raise_on_sql")
 
     __table_args__ = (
-        Index("ix_messages_embedding", "embedding", postgresql_using="ivfflat"),
+        # Composite index serves WHERE conversation_id=? ORDER BY created_at
+        # without a sort step. No INCLUDE(content): btree tuples cap at ~2.7 KB
+        # and message bodies routinely exceed that.
+        Index("ix_messages_conv_created", "conversation_id", "created_at"),
+        # Plain created_at btree so time-window scans (global summaries) walk
+        # the index in order instead of sorting the filtered heap.
+        Index("ix_messages_created_at", "created_at"),
+        Index(
+            "ix_messages_embedding",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding": "halfvec_l2_ops"},
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_where=text("embedding IS NOT NULL"),
+        ),
     )
 
 
@@ -54,7 +89,7 @@ class KnowledgeEntry(Base):
     category: Mapped[str] = mapped_column(String(50), index=True)  # preference | pattern | entity | insight
     subject: Mapped[str] = mapped_column(String(255), index=True)  # e.g. "ui_style", "deploy_platform"
     content: Mapped[str] = mapped_column(Text)  # e.g. "Prefers minimal UI with dark mode"
-    embedding = mapped_column(Vector(1536), nullable=True)
+    embedding = mapped_column(HalfVec(1536), nullable=True)
     source_conversation_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
     confidence: Mapped[float] = mapped_column(default=1.0)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -62,6 +97,27 @@ class KnowledgeEntry(Base):
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
+    __table_args__ = (
+        # Binary-quantized expression index for the cheap first-stage ANN scan
+        # (1 bit/dim Hamming distance); search_knowledge re-ranks the top k*10
+        # candidates against the full-precision column.
+        Index(
+            "ix_knowledge_embedding_bq",
+            text("(binary_quantize(embedding)::bit(1536)) bit_hamming_ops"),
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_where=text("embedding IS NOT NULL"),
+        ),
+        Index(
+            "ix_knowledge_embedding",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding": "halfvec_l2_ops"},
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_where=text("embedding IS NOT NULL"),
+        ),
+    )
+
 
 class WeeklySummary(Base):
     """Periodic compressed summaries of activity."""
@@ -73,64 +129,16 @@ class WeeklySummary(Base):
     summary: Mapped[str] = mapped_column(Text)
     projects_active: Mapped[str | None] = mapped_column(Text)  # comma-separated
     ideas_mentioned: Mapped[str | None] = mapped_column(Text)
-    embedding = mapped_column(Vector(1536), nullable=True)
+    embedding = mapped_column(HalfVec(1536), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
-
-class Insight(Base):
-    """Derived lessons, mistakes, retrospectives, playbooks."""
-    __tablename__ = "insights"
-
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    # lesson | mistake | retrospective | playbook | idea
-    type: Mapped[str] = mapped_column(String(50), index=True)
-    project: Mapped[str | None] = mapped_column(String(255), index=True)
-    title: Mapped[str] = mapped_column(String(500))
-    content: Mapped[str] = mapped_column(Text)
-    tags: Mapped[str | None] = mapped_column(Text)  # comma-separated
-    source_conversation_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
-    source_task_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
-    embedding = mapped_column(Vector(1536), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    __table_args__ = (
+        Index(
+            "ix_weekly_summaries_embedding",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding": "halfvec_l2_ops"},
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_where=text("embedding IS NOT NULL"),
+        ),
     )
-
-
-class RepoEvent(Base):
-    """GitHub repo events: commits, PRs, releases."""
-    __tablename__ = "repo_events"
-
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    # commit | pr | release | tag
-    event_type: Mapped[str] = mapped_column(String(50), index=True)
-    repo: Mapped[str] = mapped_column(String(255), index=True)  # owner/repo
-    project: Mapped[str | None] = mapped_column(String(255), index=True)
-    ref: Mapped[str | None] = mapped_column(String(255))  # sha, PR number, tag name
-    author: Mapped[str | None] = mapped_column(String(255))
-    title: Mapped[str] = mapped_column(String(500))
-    body: Mapped[str | None] = mapped_column(Text)  # commit message body, PR body
-    diff_summary: Mapped[str | None] = mapped_column(Text)  # optional summarized diff
-    url: Mapped[str | None] = mapped_column(String(500))  # link to GitHub
-    embedding = mapped_column(Vector(1536), nullable=True)
-    event_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-
-
-class TaskOutcome(Base):
-    """Per-task result tracking: what Atlas did, whether it worked, and what was learned."""
-    __tablename__ = "task_outcomes"
-
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    project: Mapped[str | None] = mapped_column(String(255), index=True)
-    # success | failure | partial
-    result: Mapped[str] = mapped_column(String(20), index=True)
-    task_description: Mapped[str] = mapped_column(Text)
-    cause: Mapped[str | None] = mapped_column(Text)  # what caused failure/success
-    fix: Mapped[str | None] = mapped_column(Text)  # what fixed it (if failure)
-    recommendation: Mapped[str | None] = mapped_column(Text)  # what to do next time
-    linked_commit: Mapped[str | None] = mapped_column(String(255))  # sha or PR URL
-    conversation_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
-    tags: Mapped[str | None] = mapped_column(Text)  # comma-separated
-    embedding = mapped_column(Vector(1536), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
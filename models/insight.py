@@ -3,10 +3,10 @@
 from datetime import datetime
 from enum import Enum as PyEnum
 
-from sqlalchemy import Column, DateTime, Enum, String, Text, func
+from sqlalchemy import Column, DateTime, Enum, Index, String, Text, func, text
 from sqlalchemy.dialects.postgresql import ARRAY
 
-from models.base import Base, generate_ulid
+from models.base import Base, HalfVec, generate_ulid
 
 
 class InsightType(str, PyEnum):
@@ -28,5 +28,17 @@ class Insight(Base):
     tags = Column(ARRAY(String), default=list)
     source_conversation_id = Column(String, nullable=True)
     source_task_id = Column(String, nullable=True)
+    embedding = Column(HalfVec(1536), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=func.now())
+
+    __table_args__ = (
+        Index(
+            "ix_insights_embedding",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding": "halfvec_l2_ops"},
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_where=text("embedding IS NOT NULL"),
+        ),
+    )
@@ -3,10 +3,10 @@
 from datetime import datetime
 from enum import Enum as PyEnum
 
-from sqlalchemy import Column, DateTime, Enum, String, Text, func
+from sqlalchemy import Column, DateTime, Enum, Index, String, Text, func, text
 from sqlalchemy.dialects.postgresql import JSONB
 
-from models.base import Base, generate_ulid
+from models.base import Base, HalfVec, generate_ulid
 
 
 class RepoEventType(str, PyEnum):
@@ -30,5 +30,17 @@ class RepoEvent(Base):
     author = Column(String, nullable=True)
     url = Column(String, nullable=True)                        # GitHub URL
     metadata_ = Column("metadata", JSONB, default=dict)        # extra (files changed, labels, etc.)
+    embedding = Column(HalfVec(1536), nullable=True)
     event_at = Column(DateTime, nullable=False)                # when the event happened on GitHub
     created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
+
+    __table_args__ = (
+        Index(
+            "ix_repo_events_embedding",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding": "halfvec_l2_ops"},
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_where=text("embedding IS NOT NULL"),
+        ),
+    )
@@ -3,10 +3,10 @@
 from datetime import datetime
 from enum import Enum as PyEnum
 
-from sqlalchemy import Column, DateTime, Enum, String, Text, func
+from sqlalchemy import Column, DateTime, Enum, Index, String, Text, func, text
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 
-from models.base import Base, generate_ulid
+from models.base import Base, HalfVec, generate_ulid
 
 
 class TaskResult(str, PyEnum):
@@ -30,4 +30,27 @@ class TaskOutcome(Base):
     linked_repo = Column(String, nullable=True)      # repo name
     tags = Column(ARRAY(String), default=list)
     metadata_ = Column("metadata", JSONB, default=dict)
+    embedding = Column(HalfVec(1536), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
+
+    __table_args__ = (
+        Index(
+            "ix_task_outcomes_embedding",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding": "halfvec_l2_ops"},
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_where=text("embedding IS NOT NULL"),
+        ),
+        # Dedicated partial graph for the hottest filtered search: "what went
+        # wrong before?" queries scope to result='failure', and a small
+        # failure-only index avoids post-filtering the full graph.
+        Index(
+            "ix_task_outcomes_embedding_failure",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding": "halfvec_l2_ops"},
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_where=text("result = 'failure' AND embedding IS NOT NULL"),
+        ),
+    )
@@ -71,67 +71,79 @@ async def auto_extract_from_conversation(
         # If model didn't return JSON, bail silently
         return {"created": 0, "error": "invalid_json"}
 
-    created = 0
+    # First pass: collect every embeddable text so the whole extraction costs a
+    # single embedding call instead of one round-trip per item.
+    all_texts: list[str] = []
+    slots: list[tuple[str, dict]] = []  # (kind, item)
 
-    # Insights
     for item in _safe_list(data.get("insights"))[:5]:
         title = (item.get("title") or "").strip()
         content = (item.get("content") or "").strip()
         if not title or not content:
             continue
-        emb = (await embed_texts([f"{title}\n{content}"]))[0]
-        ins = Insight(
-            type=item.get("type") or "lesson",
-            project=conversation.project,
-            title=title,
-            content=content,
-            tags=",".join(_safe_list(item.get("tags"))) or None,
-            source_conversation_id=conversation.id,
-            embedding=emb,
-        )
-        db.add(ins)
-        created += 1
-
-    # Knowledge
+        all_texts.append(f"{title}\n{content}")
+        slots.append(("insight", item))
+
     for item in _safe_list(data.get("knowledge"))[:5]:
         subject = (item.get("subject") or "").strip()
         content = (item.get("content") or "").strip()
         if not subject or not content:
             continue
-        emb = (await embed_texts([f"{subject}\n{content}"]))[0]
-        kn = KnowledgeEntry(
-            category=item.get("category") or "insight",
-            subject=subject,
-            content=content,
-            confidence=float(item.get("confidence") or 1.0),
-            source_conversation_id=conversation.id,
-            embedding=emb,
-        )
-        db.add(kn)
-        created += 1
-
-    # Task outcomes
+        all_texts.append(f"{subject}\n{content}")
+        slots.append(("knowledge", item))
+
     for item in _safe_list(data.get("task_outcomes"))[:5]:
         task_description = (item.get("task_description") or "").strip()
         if not task_description:
             continue
-        result = item.get("result") or "success"
-        cause = item.get("cause")
-        fix = item.get("fix")
-        recommendation = item.get("recommendation")
-        emb = (await embed_texts([task_description]))[0]
-        to = TaskOutcome(
-            project=conversation.project,
-            result=result,
-            task_description=task_description,
-            cause=cause,
-            fix=fix,
-            recommendation=recommendation,
-            conversation_id=conversation.id,
-            tags=",".join(_safe_list(item.get("tags"))) or None,
-            embedding=emb,
-        )
-        db.add(to)
-        created += 1
-
-    return {"created": created}
+        all_texts.append(task_description)
+        slots.append(("task_outcome", item))
+
+    if not slots:
+        return {"created": 0}
+
+    embs = await embed_texts(all_texts)
+
+    # Second pass: build ORM objects with their embeddings.
+    entries = []
+    for (kind, item), emb in zip(slots, embs, strict=False):
+        if kind == "insight":
+            entries.append(
+                Insight(
+                    type=item.get("type") or "lesson",
+                    project=conversation.project,
+                    title=(item.get("title") or "").strip(),
+                    content=(item.get("content") or "").strip(),
+                    tags=_safe_list(item.get("tags")),
+                    source_conversation_id=str(conversation.id),
+                    embedding=emb,
+                )
+            )
+        elif kind == "knowledge":
+            entries.append(
+                KnowledgeEntry(
+                    category=item.get("category") or "insight",
+                    subject=(item.get("subject") or "").strip(),
+                    content=(item.get("content") or "").strip(),
+                    confidence=float(item.get("confidence") or 1.0),
+                    source_conversation_id=conversation.id,
+                    embedding=emb,
+                )
+            )
+        else:
+            entries.append(
+                TaskOutcome(
+                    project=conversation.project,
+                    result=item.get("result") or "success",
+                    task_description=(item.get("task_description") or "").strip(),
+                    cause=item.get("cause"),
+                    fix=item.get("fix"),
+                    recommendation=item.get("recommendation"),
+                    conversation_id=str(conversation.id),
+                    tags=_safe_list(item.get("tags")),
+                    embedding=emb,
+                )
+            )
+
+    db.add_all(entries)
+    return {"created": len(entries)}
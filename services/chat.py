@@ -1,7 +1,16 @@
+import asyncio
+import concurrent.futures
+import functools
+import uuid
+from datetime import datetime, timezone
+
+import orjson
 import tiktoken
-from fastapi import APIRouter, Depends
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from core.database import get_db
 from models.chat import Conversation, Message
@@ -13,35 +22,96 @@ from services.auto_extract import auto_extract_from_conversation
 router = APIRouter(dependencies=[Depends(require_api_key)])
 
 
-def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+@functools.lru_cache(maxsize=8)
+def _enc(model: str) -> tiktoken.Encoding:
+    """Memoized encoder lookup — encoding_for_model loads the BPE ranks table from disk."""
     try:
-        enc = tiktoken.encoding_for_model(model)
+        return tiktoken.encoding_for_model(model)
     except Exception:
-        enc = tiktoken.get_encoding("cl100k_base")
-    return len(enc.encode(text))
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    return len(_enc(model).encode(text))
+
+
+# Oversized payloads (10k+ token messages) tokenize on a small process pool so
+# the Python-side pre/post work can't stall a worker's event loop; below the
+# threshold a thread is cheaper than pickling to another process.
+_PROCESS_POOL_THRESHOLD_CHARS = 200_000
+_pool: concurrent.futures.ProcessPoolExecutor | None = None
+
+
+def _warm_tiktoken() -> None:
+    _enc("gpt-4o-mini")
+
+
+def _encode_batch_lens(model: str, texts: list[str]) -> list[int]:
+    return [len(t) for t in _enc(model).encode_batch(texts)]
+
+
+def _get_pool() -> concurrent.futures.ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = concurrent.futures.ProcessPoolExecutor(max_workers=2, initializer=_warm_tiktoken)
+    return _pool
 
 
 @router.post("/", response_model=ConversationOut)
 async def create_conversation(payload: ConversationCreate, db: AsyncSession = Depends(get_db)):
-    conv = Conversation(project=payload.project, title=payload.title)
-    db.add(conv)
-    await db.flush()
+    # INSERT ... RETURNING hands back the server-defaulted fields (id,
+    # created_at, updated_at) in the same round-trip — no refresh needed later.
+    conv = (
+        await db.execute(
+            insert(Conversation)
+            .values(project=payload.project, title=payload.title)
+            .returning(Conversation)
+        )
+    ).scalar_one()
 
     contents = [m.content for m in payload.messages]
-    embeddings = await embed_texts(contents)
-
-    for m, e in zip(payload.messages, embeddings, strict=False):
-        msg = Message(
-            conversation_id=conv.id,
-            role=m.role,
-            content=m.content,
-            embedding=e,
-            token_count=count_tokens(m.content),
+    # Overlap the embedding round-trip (network) with tokenization (CPU); the
+    # executor offload keeps the BPE work from blocking the event loop.
+    if sum(len(c) for c in contents) > _PROCESS_POOL_THRESHOLD_CHARS:
+        tokens_task = asyncio.get_running_loop().run_in_executor(
+            _get_pool(), _encode_batch_lens, "gpt-4o-mini", contents
+        )
+    else:
+        tokens_task = asyncio.to_thread(_encode_batch_lens, "gpt-4o-mini", contents)
+    embeddings, token_counts = await asyncio.gather(embed_texts(contents), tokens_task)
+
+    # Single multi-row INSERT instead of one statement per message; chunked so
+    # huge conversations don't blow the bind-parameter limit.
+    rows = [
+        {
+            "conversation_id": conv.id,
+            "role": m.role,
+            "content": m.content,
+            "embedding": e,
+            "token_count": tc,
+        }
+        for m, e, tc in zip(payload.messages, embeddings, token_counts, strict=False)
+    ]
+    if len(rows) > 256:
+        # Large imports (transcript replays) go over binary COPY: no SQL parse
+        # or per-row bind, and embeddings stream as raw bytes. COPY bypasses
+        # column defaults, so id/created_at are filled in client-side.
+        now = datetime.now(timezone.utc)
+        records = (
+            (uuid.uuid4(), r["conversation_id"], r["role"], r["content"], r["embedding"], r["token_count"], now)
+            for r in rows
         )
-        db.add(msg)
+        raw = await (await db.connection()).get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            "messages",
+            records=records,
+            columns=["id", "conversation_id", "role", "content", "embedding", "token_count", "created_at"],
+        )
+    else:
+        for i in range(0, len(rows), 500):
+            await db.execute(insert(Message), rows[i : i + 500])
 
     await db.commit()
-    await db.refresh(conv)
 
     # Best-effort auto extraction (insights/knowledge/task outcomes). Never break ingestion.
     try:
@@ -65,13 +135,57 @@ async def create_conversation(payload: ConversationCreate, db: AsyncSession = De
 
 
 @router.get("/{conversation_id}")
-async def get_conversation(conversation_id: str, db: AsyncSession = Depends(get_db)):
-    conv = (await db.execute(select(Conversation).where(Conversation.id == conversation_id))).scalar_one()
-    msgs = (
-        await db.execute(select(Message).where(Message.conversation_id == conv.id).order_by(Message.created_at.asc()))
-    ).scalars().all()
+async def get_conversation(conversation_id: str, request: Request, db: AsyncSession = Depends(get_db)):
+    # Opt-in streaming for very long chats: with Accept: application/x-ndjson
+    # we emit one JSON line per message straight off the DB cursor instead of
+    # materializing the whole conversation in memory.
+    if "application/x-ndjson" in request.headers.get("accept", ""):
+        conv = (
+            await db.execute(select(Conversation).where(Conversation.id == conversation_id))
+        ).scalar_one()
+
+        async def gen():
+            yield orjson.dumps(
+                {
+                    "id": conv.id,
+                    "project": conv.project,
+                    "title": conv.title,
+                    "summary": conv.summary,
+                    "created_at": conv.created_at,
+                    "updated_at": conv.updated_at,
+                }
+            ) + b"\n"
+            result = await db.stream_scalars(
+                select(Message)
+                .where(Message.conversation_id == conv.id)
+                .order_by(Message.created_at.asc())
+            )
+            async for m in result:
+                yield orjson.dumps(
+                    {
+                        "id": m.id,
+                        "role": m.role,
+                        "content": m.content,
+                        "token_count": m.token_count,
+                        "created_at": m.created_at,
+                    }
+                ) + b"\n"
+
+        return StreamingResponse(gen(), media_type="application/x-ndjson")
+
+    # Eager-load messages in the same execute instead of a second round-trip;
+    # the relationship orders them by created_at.
+    conv = (
+        await db.execute(
+            select(Conversation)
+            .where(Conversation.id == conversation_id)
+            .options(selectinload(Conversation.messages))
+        )
+    ).scalar_one()
+    msgs = conv.messages
+    # orjson serializes UUIDs/datetimes natively — no str() coercion needed.
     return {
-        "id": str(conv.id),
+        "id": conv.id,
         "project": conv.project,
         "title": conv.title,
         "summary": conv.summary,
@@ -79,7 +193,7 @@ async def get_conversation(conversation_id: str, db: AsyncSession = Depends(get_
         "updated_at": conv.updated_at,
         "messages": [
             {
-                "id": str(m.id),
+                "id": m.id,
                 "role": m.role,
                 "content": m.content,
                 "token_count": m.token_count,
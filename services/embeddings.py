@@ -1,10 +1,66 @@
-import os
+import asyncio
+import functools
+import hashlib
+from collections import OrderedDict
 from typing import Sequence
 
 import numpy as np
 
+from core.cache import get_redis
 from core.settings import settings
 
+# Coalescing batcher: concurrent embed_texts() calls within a short window are
+# merged into a single provider request, so N concurrent ingests pay one HTTP
+# round-trip instead of N.
+_MAX_BATCH = 256
+_MAX_WAIT_MS = 10
+
+_queue: asyncio.Queue | None = None
+_worker: asyncio.Task | None = None
+
+# Content-hashed LRU over provider embeddings: repeated search queries and
+# re-ingested duplicate texts skip the provider round-trip entirely.
+_CACHE_MAX = 10_000
+_cache: OrderedDict[bytes, np.ndarray] = OrderedDict()
+
+_client = None
+
+
+def _cache_key(text: str) -> bytes:
+    return hashlib.sha256(settings.embedding_model.encode() + b"\0" + text.encode()).digest()
+
+
+def _redis_key(key: bytes) -> str:
+    # Prefix by model and dim so models never collide and a dim's entries can
+    # be flushed independently.
+    model = settings.embedding_model
+    return f"emb:{model}:{_dim_for_model(model)}:{key.hex()}"
+
+
+def _get_client():
+    """Return a lazily constructed module-level AsyncOpenAI client.
+
+    A single client keeps the httpx connection pool (and its TLS sessions to
+    api.openai.com) alive across requests instead of rebuilding it per call.
+    """
+    global _client
+    if _client is None:
+        # Lazy-import OpenAI only when configured to avoid hard dependency during local/dev.
+        try:
+            import httpx
+            from openai import AsyncOpenAI  # type: ignore
+        except Exception as e:
+            raise RuntimeError("OPENAI_API_KEY is set but the 'openai' package is not installed") from e
+
+        _client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            max_retries=2,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+            ),
+        )
+    return _client
+
 
 def _dim_for_model(model: str) -> int:
     # Default dims for OpenAI text-embedding-3-small/large; configurable later.
@@ -13,29 +69,151 @@ def _dim_for_model(model: str) -> int:
     return 1536
 
 
-async def embed_texts(texts: Sequence[str]) -> list[list[float]]:
+async def _provider_embed(texts: list[str]) -> list[np.ndarray]:
+    """Single OpenAI embeddings request for a batch of texts."""
+    client = _get_client()
+    resp = await client.embeddings.create(model=settings.embedding_model, input=texts)
+    # float32 ndarrays go over the wire via asyncpg's binary vector codec
+    # instead of being rendered as text element by element. L2-normalize so the
+    # stored vectors are unit length (OpenAI v3 vectors aren't guaranteed to
+    # be) and L2 distance ranks identically to cosine.
+    out = np.asarray([d.embedding for d in resp.data], dtype=np.float32)
+    out /= np.linalg.norm(out, axis=1, keepdims=True) + 1e-8
+    return list(out)
+
+
+def _ensure_batcher() -> asyncio.Queue:
+    """Create the queue + background drain task lazily (needs a running loop)."""
+    global _queue, _worker
+    if _queue is None:
+        _queue = asyncio.Queue()
+    if _worker is None or _worker.done():
+        _worker = asyncio.get_running_loop().create_task(_drain_batches())
+    return _queue
+
+
+async def _drain_batches() -> None:
+    """Collect pending (texts, future) pairs for up to _MAX_WAIT_MS / _MAX_BATCH
+    inputs, issue one provider call, and fan results back per caller."""
+    loop = asyncio.get_running_loop()
+    while True:
+        texts, fut = await _queue.get()
+        pending: list[tuple[list[str], asyncio.Future]] = [(texts, fut)]
+        total = len(texts)
+        deadline = loop.time() + _MAX_WAIT_MS / 1000
+        while total < _MAX_BATCH:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                texts, fut = await asyncio.wait_for(_queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            pending.append((texts, fut))
+            total += len(texts)
+
+        all_texts = [t for batch_texts, _ in pending for t in batch_texts]
+        try:
+            embeddings = await _provider_embed(all_texts)
+        except Exception as e:
+            for _, batch_fut in pending:
+                if not batch_fut.done():
+                    batch_fut.set_exception(e)
+            continue
+
+        offset = 0
+        for batch_texts, batch_fut in pending:
+            if not batch_fut.done():
+                batch_fut.set_result(embeddings[offset : offset + len(batch_texts)])
+            offset += len(batch_texts)
+
+
+async def embed_texts(texts: Sequence[str]) -> list[np.ndarray]:
     """Embed texts using OpenAI if configured; otherwise return deterministic hash embeddings.
 
+    Concurrent callers are coalesced into one provider request per batch window.
     The hash fallback keeps local/dev working without external keys.
     """
-    # Lazy-import OpenAI only when configured to avoid hard dependency during local/dev.
     if settings.openai_api_key:
-        try:
-            from openai import AsyncOpenAI  # type: ignore
-        except Exception as e:
-            raise RuntimeError("OPENAI_API_KEY is set but the 'openai' package is not installed") from e
+        keys = [_cache_key(t) for t in texts]
+        results: list[np.ndarray | None] = [None] * len(texts)
+        misses: list[int] = []
+        for i, key in enumerate(keys):
+            cached = _cache.get(key)
+            if cached is not None:
+                _cache.move_to_end(key)
+                results[i] = cached
+            else:
+                misses.append(i)
+
+        # Second tier: Redis survives restarts and is shared across workers.
+        redis = get_redis()
+        if misses and redis is not None:
+            try:
+                raw_hits = await redis.mget([_redis_key(keys[i]) for i in misses])
+            except Exception:
+                raw_hits = [None] * len(misses)
+            remaining: list[int] = []
+            for i, raw in zip(misses, raw_hits, strict=False):
+                if raw is not None:
+                    emb = np.frombuffer(raw, dtype=np.float32).copy()
+                    results[i] = emb
+                    _cache[keys[i]] = emb
+                    if len(_cache) > _CACHE_MAX:
+                        _cache.popitem(last=False)
+                else:
+                    remaining.append(i)
+            misses = remaining
 
-        client = AsyncOpenAI(api_key=settings.openai_api_key)
-        resp = await client.embeddings.create(model=settings.embedding_model, input=list(texts))
-        return [d.embedding for d in resp.data]
+        if misses:
+            queue = _ensure_batcher()
+            fut: asyncio.Future = asyncio.get_running_loop().create_future()
+            queue.put_nowait(([texts[i] for i in misses], fut))
+            fresh = list(zip(misses, await fut, strict=False))
+            for i, emb in fresh:
+                results[i] = emb
+                _cache[keys[i]] = emb
+                if len(_cache) > _CACHE_MAX:
+                    _cache.popitem(last=False)
+            if redis is not None:
+                try:
+                    async with redis.pipeline(transaction=False) as pipe:
+                        for i, emb in fresh:
+                            pipe.set(
+                                _redis_key(keys[i]),
+                                np.asarray(emb, dtype=np.float32).tobytes(),
+                                ex=settings.embedding_cache_ttl,
+                            )
+                        await pipe.execute()
+                except Exception:
+                    pass  # cache write-back is best-effort
+        return results
 
-    # Fallback: stable pseudo-embedding
+    # Fallback: stable pseudo-embedding.
     dim = _dim_for_model(settings.embedding_model)
-    out: list[list[float]] = []
-    for t in texts:
-        seed = abs(hash(t)) % (2**32)
-        rng = np.random.default_rng(seed)
-        v = rng.normal(size=(dim,)).astype(np.float32)
-        v /= np.linalg.norm(v) + 1e-8
-        out.append(v.tolist())
-    return out
+    return [_hash_embed(t, dim) for t in texts]
+
+
+async def embed_one(text: str) -> np.ndarray:
+    """Embed a single text.
+
+    Concurrent single-text callers (the create endpoints) ride the same
+    coalescing queue as embed_texts, so an ingest burst becomes one provider
+    request instead of one per POST.
+    """
+    return (await embed_texts([text]))[0]
+
+
+@functools.lru_cache(maxsize=4096)
+def _hash_embed(text: str, dim: int) -> np.ndarray:
+    """Deterministic unit-norm pseudo-embedding for a single text.
+
+    Seeded from blake2b rather than hash() — the latter is randomized per
+    process (PYTHONHASHSEED), so identical texts would embed differently
+    across workers and the lru_cache would never hit cross-restart fixtures.
+    """
+    seed = int.from_bytes(hashlib.blake2b(text.encode(), digest_size=4).digest(), "big")
+    v = np.empty(dim, dtype=np.float32)
+    np.random.default_rng(seed).standard_normal(out=v, dtype=np.float32)
+    v /= np.linalg.norm(v) + 1e-8
+    return v
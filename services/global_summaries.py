@@ -10,11 +10,12 @@ We store the result as a WeeklySummary row with projects_active/ideas_mentioned
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel, Field
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import get_db as get_session
@@ -33,6 +34,37 @@ class GlobalSummaryGenerateRequest(BaseModel):
     model: str = "gpt-4o-mini"
 
 
+# Constant prompt prefixes, built once at import. Only the per-slice /
+# per-window bits are formatted at call time.
+_MAP_PROMPT_HEADER = (
+    "Summarize this slice of Atlas conversation history. Be concise and factual.\n\n"
+    "Return bullets under these headings:\n"
+    "- Key events/changes (3-8 bullets)\n"
+    "- Decisions (0-6 bullets)\n"
+    "- Mistakes / failure patterns (0-6 bullets)\n"
+    "- Preferences (0-6 bullets)\n"
+    "- Open threads / next steps (0-6 bullets)\n\n"
+)
+
+_REDUCE_PROMPT_HEADER = (
+    "Combine these partial summaries into ONE global summary of the full history window.\n"
+    "De-duplicate aggressively and keep it short.\n\n"
+    "Return in this exact format:\n"
+    "Projects active: comma-separated list\n"
+    "Themes: 3-8 bullets\n"
+    "Key decisions: 3-10 bullets\n"
+    "Recurring mistakes: 0-8 bullets\n"
+    "Preferences & patterns: 3-10 bullets\n"
+    "Current state: 3-8 bullets\n"
+    "Next steps: 3-10 bullets\n"
+    "Ideas mentioned: comma-separated list\n\n"
+)
+
+
+def _build_map_prompt(i: int, n_chunks: int, start: datetime, chunk: str) -> str:
+    return f"{_MAP_PROMPT_HEADER}Slice {i}/{n_chunks} (time window starts {start.date()}):\n\nTranscript:\n{chunk}"
+
+
 def _parse_header_list(text: str, header: str) -> list[str] | None:
     for line in text.splitlines():
         if line.lower().startswith(header.lower()):
@@ -48,82 +80,78 @@ async def generate_global_summary(req: GlobalSummaryGenerateRequest, db: AsyncSe
     now = datetime.now(timezone.utc)
     start = now - timedelta(days=req.days)
 
+    # Format each transcript line in Postgres (native C concat/to_char) so
+    # Python does one attribute read per row instead of an f-string plus an
+    # isoformat() call — the wire carries exactly the bytes we need.
+    line = func.concat(
+        "[",
+        func.to_char(Message.created_at, 'YYYY-MM-DD"T"HH24:MI:SS'),
+        "] (",
+        func.coalesce(Conversation.project, "general"),
+        ") ",
+        Message.role,
+        ": ",
+        Message.content,
+    ).label("line")
+
     stmt = (
-        select(
-            Message.role,
-            Message.content,
-            Message.created_at,
-            Conversation.project,
-        )
+        select(line)
         .join(Conversation, Conversation.id == Message.conversation_id)
         .where(Message.created_at >= start)
         .order_by(Message.created_at.asc())
         .limit(req.max_messages)
     )
 
-    rows = (await db.execute(stmt)).all()
-
-    # Build a single transcript string, then chunk it by character count.
-    lines = [
-        f"[{r.created_at.isoformat()}] ({r.project or 'general'}) {r.role}: {r.content}"
-        for r in rows
-    ]
-    transcript = "\n".join(lines)
+    # Stream in server-side batches instead of materializing up to
+    # max_messages rows at once; chunking only ever holds one buffer of
+    # ~chunk_chars plus the current batch.
+    result = await db.stream(stmt.execution_options(yield_per=1000))
 
+    # Chunk directly while formatting each row — no full-transcript copy and
+    # no second pass over a lines list.
+    n_messages = 0
     chunks: list[str] = []
     buf: list[str] = []
     buf_len = 0
-    for line in lines:
+    async for r in result:
+        n_messages += 1
         # +1 for newline
-        l = len(line) + 1
+        l = len(r.line) + 1
         if buf and buf_len + l > req.chunk_chars:
             chunks.append("\n".join(buf))
             buf = []
             buf_len = 0
-        buf.append(line)
+        buf.append(r.line)
         buf_len += l
     if buf:
         chunks.append("\n".join(buf))
 
-    # Map step: summarize each chunk
-    chunk_summaries: list[str] = []
-    for i, chunk in enumerate(chunks, 1):
-        prompt = (
-            "Summarize this slice of Atlas conversation history. Be concise and factual.\n\n"
-            "Return bullets under these headings:\n"
-            "- Key events/changes (3-8 bullets)\n"
-            "- Decisions (0-6 bullets)\n"
-            "- Mistakes / failure patterns (0-6 bullets)\n"
-            "- Preferences (0-6 bullets)\n"
-            "- Open threads / next steps (0-6 bullets)\n\n"
-            f"Slice {i}/{len(chunks)} (time window starts {start.date()}):\n\n"
-            f"Transcript:\n{chunk}"
+    # Map step: all chunk summaries fly in parallel; wall time drops from sum
+    # to max of per-chunk latencies. llm_summarize itself gates concurrency
+    # (settings.llm_concurrency) and retries 429s with backoff.
+    chunk_summaries = list(
+        await asyncio.gather(
+            *(
+                llm_summarize(_build_map_prompt(i, len(chunks), start, chunk), model=req.model)
+                for i, chunk in enumerate(chunks, 1)
+            )
         )
-        chunk_summaries.append(await llm_summarize(prompt, model=req.model))
+    )
 
     # Reduce step: merge chunk summaries into one global summary
     reduce_prompt = (
-        "Combine these partial summaries into ONE global summary of the full history window.\n"
-        "De-duplicate aggressively and keep it short.\n\n"
-        "Return in this exact format:\n"
-        "Projects active: comma-separated list\n"
-        "Themes: 3-8 bullets\n"
-        "Key decisions: 3-10 bullets\n"
-        "Recurring mistakes: 0-8 bullets\n"
-        "Preferences & patterns: 3-10 bullets\n"
-        "Current state: 3-8 bullets\n"
-        "Next steps: 3-10 bullets\n"
-        "Ideas mentioned: comma-separated list\n\n"
-        f"Window: {start.date()} -> {now.date()}\n\n"
+        f"{_REDUCE_PROMPT_HEADER}Window: {start.date()} -> {now.date()}\n\n"
         "Partial summaries:\n" + "\n\n---\n\n".join(chunk_summaries)
     )
 
     summary_text = await llm_summarize(reduce_prompt, model=req.model)
 
+    # Kick the embedding request off immediately; header parsing (pure CPU,
+    # microseconds) runs while the round-trip is in flight.
+    emb_task = asyncio.create_task(embed_texts([summary_text]))
     projects_active = _parse_header_list(summary_text, "Projects active")
     ideas_mentioned = _parse_header_list(summary_text, "Ideas mentioned")
-
-    emb = (await embed_texts([summary_text]))[0]
+    emb = (await emb_task)[0]
 
     ws = WeeklySummary(
         week_start=start,
@@ -144,6 +172,6 @@ async def generate_global_summary(req: GlobalSummaryGenerateRequest, db: AsyncSe
         "summary": ws.summary,
         "projects_active": projects_active,
         "ideas_mentioned": ideas_mentioned,
-        "messages_considered": len(rows),
+        "messages_considered": n_messages,
         "chunks": len(chunks),
     }
@@ -1,18 +1,31 @@
 """Insights router — CRUD + vector search for lessons, mistakes, retrospectives, playbooks, ideas."""
 
 from fastapi import APIRouter, Depends
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from pgvector.sqlalchemy import Vector
 
-from core.database import get_db as get_session
+from core.database import get_db as get_session, set_ef_search
 from models.insight import Insight
 from services.auth import require_api_key
-from services.embeddings import embed_texts
+from services.embeddings import embed_one, embed_texts
 from services.schemas import InsightCreate, InsightOut, InsightSearch
 
 router = APIRouter(prefix="/insights", tags=["insights"], dependencies=[Depends(require_api_key)])
 
+# Exactly the columns InsightOut serializes — keeps the 6 KB embedding vector
+# (and ORM hydration) out of list/search responses.
+_INSIGHT_COLS = (
+    Insight.id,
+    Insight.type,
+    Insight.project,
+    Insight.title,
+    Insight.content,
+    Insight.tags,
+    Insight.created_at,
+    Insight.updated_at,
+)
+
 
 @router.post("", response_model=InsightOut, status_code=201)
 async def create_insight(req: InsightCreate, db: AsyncSession = Depends(get_session)):
@@ -20,21 +33,26 @@ async def create_insight(req: InsightCreate, db: AsyncSession = Depends(get_sess
 
     # Generate embedding from title + content
     embed_text = f"{req.title}\n{req.content}"
-    embeddings = await embed_texts([embed_text])
-
-    insight = Insight(
-        type=req.type,
-        title=req.title,
-        content=req.content,
-        project=req.project,
-        tags=tags_list,
-        source_conversation_id=req.source_conversation_id,
-        source_task_id=req.source_task_id,
-        embedding=embeddings[0],
+    embedding = await embed_one(embed_text)
+
+    # INSERT ... RETURNING hands back the row (server defaults included) in
+    # the same round-trip, so no post-commit refresh SELECT.
+    stmt = (
+        insert(Insight)
+        .values(
+            type=req.type,
+            title=req.title,
+            content=req.content,
+            project=req.project,
+            tags=tags_list,
+            source_conversation_id=req.source_conversation_id,
+            source_task_id=req.source_task_id,
+            embedding=embedding,
+        )
+        .returning(Insight)
     )
-    db.add(insight)
+    insight = (await db.execute(select(Insight).from_statement(stmt))).scalar_one()
     await db.commit()
-    await db.refresh(insight)
     return insight
 
 
@@ -45,13 +63,13 @@ async def list_insights(
     limit: int = 50,
     db: AsyncSession = Depends(get_session),
 ):
-    stmt = select(Insight).order_by(Insight.created_at.desc()).limit(limit)
+    stmt = select(*_INSIGHT_COLS).order_by(Insight.created_at.desc()).limit(limit)
     if project is not None:
         stmt = stmt.where(Insight.project == project)
     if type is not None:
         stmt = stmt.where(Insight.type == type)
     result = await db.execute(stmt)
-    return result.scalars().all()
+    return result.mappings().all()
 
 
 @router.get("/{insight_id}", response_model=InsightOut)
@@ -71,7 +89,7 @@ async def search_insights(req: InsightSearch, db: AsyncSession = Depends(get_ses
         # Vector similarity search
         q_emb = (await embed_texts([req.query]))[0]
 
-        stmt = select(Insight).where(Insight.embedding.is_not(None))
+        stmt = select(*_INSIGHT_COLS).where(Insight.embedding.is_not(None))
 
         if req.project and req.include_global:
             stmt = stmt.where((Insight.project == req.project) | (Insight.project.is_(None)))
@@ -82,9 +100,10 @@ async def search_insights(req: InsightSearch, db: AsyncSession = Depends(get_ses
             stmt = stmt.where(Insight.type == req.type)
 
         stmt = stmt.order_by(Insight.embedding.op("<->")(q_emb)).limit(req.k)
+        await set_ef_search(db, req.k)
     else:
         # No query — just list with filters
-        stmt = select(Insight).order_by(Insight.created_at.desc()).limit(req.k)
+        stmt = select(*_INSIGHT_COLS).order_by(Insight.created_at.desc()).limit(req.k)
 
         if req.project and req.include_global:
             stmt = stmt.where((Insight.project == req.project) | (Insight.project.is_(None)))
@@ -95,4 +114,4 @@ async def search_insights(req: InsightSearch, db: AsyncSession = Depends(get_ses
             stmt = stmt.where(Insight.type == req.type)
 
     result = await db.execute(stmt)
-    return result.scalars().all()
+    return result.mappings().all()
@@ -1,34 +1,69 @@
 """Knowledge entries router — CRUD + vector search for cross-project knowledge graph."""
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from pgvector.sqlalchemy import BIT
+from sqlalchemy import cast, delete, func, insert, literal, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import get_db as get_session
+from core.database import async_session, get_db as get_session, set_ef_search
+from models.base import HalfVec
 from models.chat import KnowledgeEntry
 from services.auth import require_api_key
-from services.embeddings import embed_texts
+from services.embeddings import embed_one, embed_texts
 from services.schemas import KnowledgeCreate, KnowledgeOut, KnowledgeSearch
 
 router = APIRouter(prefix="/knowledge", tags=["knowledge"], dependencies=[Depends(require_api_key)])
 
+# Exactly the columns KnowledgeOut serializes — listings skip the embedding
+# vector instead of hydrating whole entities.
+_KNOWLEDGE_COLS = (
+    KnowledgeEntry.id,
+    KnowledgeEntry.category,
+    KnowledgeEntry.subject,
+    KnowledgeEntry.content,
+    KnowledgeEntry.confidence,
+    KnowledgeEntry.source_conversation_id,
+    KnowledgeEntry.created_at,
+    KnowledgeEntry.updated_at,
+)
+
+
+async def _embed_knowledge(entry_id, embed_text: str) -> None:
+    """Background step: embed after the response went out, on a fresh session."""
+    try:
+        emb = await embed_one(embed_text)
+        async with async_session() as session:
+            await session.execute(
+                update(KnowledgeEntry).where(KnowledgeEntry.id == entry_id).values(embedding=emb)
+            )
+            await session.commit()
+    except Exception:
+        pass  # row stays unembedded; search filters on embedding IS NOT NULL
+
 
 @router.post("", response_model=KnowledgeOut, status_code=201)
-async def create_knowledge(req: KnowledgeCreate, db: AsyncSession = Depends(get_session)):
-    embed_text = f"{req.subject}: {req.content}"
-    embeddings = await embed_texts([embed_text])
-
-    entry = KnowledgeEntry(
-        category=req.category,
-        subject=req.subject,
-        content=req.content,
-        source_conversation_id=req.source_conversation_id,
-        confidence=req.confidence,
-        embedding=embeddings[0],
+async def create_knowledge(
+    req: KnowledgeCreate, background: BackgroundTasks, db: AsyncSession = Depends(get_session)
+):
+    # INSERT ... RETURNING hands back the row (server defaults included) in
+    # the same round-trip, so no post-commit refresh SELECT. The embedding is
+    # deferred to a background task, so response latency is the DB write only;
+    # until it lands the row just isn't visible to similarity search.
+    stmt = (
+        insert(KnowledgeEntry)
+        .values(
+            category=req.category,
+            subject=req.subject,
+            content=req.content,
+            source_conversation_id=req.source_conversation_id,
+            confidence=req.confidence,
+            embedding=None,
+        )
+        .returning(KnowledgeEntry)
     )
-    db.add(entry)
+    entry = (await db.execute(select(KnowledgeEntry).from_statement(stmt))).scalar_one()
     await db.commit()
-    await db.refresh(entry)
+    background.add_task(_embed_knowledge, entry.id, f"{req.subject}: {req.content}")
     return entry
 
 
@@ -39,13 +74,13 @@ async def list_knowledge(
     limit: int = 50,
     db: AsyncSession = Depends(get_session),
 ):
-    stmt = select(KnowledgeEntry).order_by(KnowledgeEntry.updated_at.desc()).limit(limit)
+    stmt = select(*_KNOWLEDGE_COLS).order_by(KnowledgeEntry.updated_at.desc()).limit(limit)
     if category:
         stmt = stmt.where(KnowledgeEntry.category == category)
     if subject:
         stmt = stmt.where(KnowledgeEntry.subject == subject)
     result = await db.execute(stmt)
-    return result.scalars().all()
+    return result.mappings().all()
 
 
 @router.get("/{entry_id}", response_model=KnowledgeOut)
@@ -60,33 +95,50 @@ async def get_knowledge(entry_id: str, db: AsyncSession = Depends(get_session)):
 @router.put("/{entry_id}", response_model=KnowledgeOut)
 async def update_knowledge(entry_id: str, req: KnowledgeCreate, db: AsyncSession = Depends(get_session)):
     """Update an existing knowledge entry (upsert-style by ID)."""
-    result = await db.execute(select(KnowledgeEntry).where(KnowledgeEntry.id == entry_id))
-    entry = result.scalar_one_or_none()
-    if not entry:
+    # Cheap two-column probe so confidence/category-only edits (the common
+    # fixup case) skip the embedding provider round-trip entirely.
+    current = (
+        await db.execute(
+            select(KnowledgeEntry.subject, KnowledgeEntry.content).where(KnowledgeEntry.id == entry_id)
+        )
+    ).one_or_none()
+    if current is None:
         raise HTTPException(404, "Knowledge entry not found")
 
-    embed_text = f"{req.subject}: {req.content}"
-    embeddings = await embed_texts([embed_text])
-
-    entry.category = req.category
-    entry.subject = req.subject
-    entry.content = req.content
-    entry.confidence = req.confidence
-    entry.source_conversation_id = req.source_conversation_id
-    entry.embedding = embeddings[0]
+    values = {
+        "category": req.category,
+        "subject": req.subject,
+        "content": req.content,
+        "confidence": req.confidence,
+        "source_conversation_id": req.source_conversation_id,
+    }
+    if (current.subject, current.content) != (req.subject, req.content):
+        values["embedding"] = await embed_one(f"{req.subject}: {req.content}")
+
+    # Single UPDATE ... RETURNING instead of select + mutate + refresh — one
+    # round-trip, and the row lock is held only for the update itself.
+    stmt = (
+        update(KnowledgeEntry)
+        .where(KnowledgeEntry.id == entry_id)
+        .values(**values)
+        .returning(KnowledgeEntry)
+    )
+    orm_stmt = select(KnowledgeEntry).from_statement(stmt).execution_options(populate_existing=True)
+    entry = (await db.execute(orm_stmt)).scalar_one_or_none()
+    if not entry:
+        raise HTTPException(404, "Knowledge entry not found")
 
     await db.commit()
-    await db.refresh(entry)
     return entry
 
 
 @router.delete("/{entry_id}")
 async def delete_knowledge(entry_id: str, db: AsyncSession = Depends(get_session)):
-    result = await db.execute(select(KnowledgeEntry).where(KnowledgeEntry.id == entry_id))
-    entry = result.scalar_one_or_none()
-    if not entry:
+    result = await db.execute(
+        delete(KnowledgeEntry).where(KnowledgeEntry.id == entry_id).returning(KnowledgeEntry.id)
+    )
+    if result.scalar_one_or_none() is None:
         raise HTTPException(404, "Knowledge entry not found")
-    await db.delete(entry)
     await db.commit()
     return {"deleted": True}
 
@@ -96,12 +148,28 @@ async def search_knowledge(req: KnowledgeSearch, db: AsyncSession = Depends(get_
     """Vector similarity search over knowledge entries."""
     if req.query:
         q_emb = (await embed_texts([req.query]))[0]
-        stmt = select(KnowledgeEntry).where(KnowledgeEntry.embedding.is_not(None))
 
-        if req.category:
-            stmt = stmt.where(KnowledgeEntry.category == req.category)
+        # Two-stage search: a cheap 1-bit-per-dim Hamming scan over the
+        # binary-quantized expression index picks k*10 candidates, then the
+        # full-precision halfvec column re-ranks them down to k. The cast
+        # must match ix_knowledge_embedding_bq exactly for the index to hit.
+        q_param = literal(q_emb, HalfVec(1536))
+        bq = cast(func.binary_quantize(KnowledgeEntry.embedding), BIT(1536))
+        q_bq = cast(func.binary_quantize(q_param), BIT(1536))
 
-        stmt = stmt.order_by(KnowledgeEntry.embedding.op("<->")(q_emb)).limit(req.k)
+        cand = select(KnowledgeEntry.id).where(KnowledgeEntry.embedding.is_not(None))
+        if req.category:
+            cand = cand.where(KnowledgeEntry.category == req.category)
+        cand = cand.order_by(bq.op("<~>")(q_bq)).limit(req.k * 10).subquery()
+
+        stmt = (
+            select(KnowledgeEntry)
+            .join(cand, KnowledgeEntry.id == cand.c.id)
+            .order_by(KnowledgeEntry.embedding.op("<->")(q_emb))
+            .limit(req.k)
+        )
+        # ef_search = max(40, k*10) also covers the candidate-stage LIMIT.
+        await set_ef_search(db, req.k)
     else:
         stmt = select(KnowledgeEntry).order_by(KnowledgeEntry.updated_at.desc()).limit(req.k)
         if req.category:
@@ -6,28 +6,70 @@ unless it's actually used.
 
 from __future__ import annotations
 
+import asyncio
+import random
+
 from core.settings import settings
 
+_client = None
+_llm_sem: asyncio.Semaphore | None = None
+
+
+def _get_sem() -> asyncio.Semaphore:
+    # Built lazily so the semaphore binds to the running event loop.
+    global _llm_sem
+    if _llm_sem is None:
+        _llm_sem = asyncio.Semaphore(settings.llm_concurrency)
+    return _llm_sem
+
+
+def _get_client():
+    """Lazily build one module-level AsyncOpenAI client.
+
+    Per-call construction cost a fresh connection pool + TLS handshake for
+    every chunk of the parallel map step; one client lets HTTP/2 multiplex
+    concurrent completions over warm connections.
+    """
+    global _client
+    if _client is None:
+        try:
+            from openai import AsyncOpenAI  # type: ignore
+        except Exception as e:
+            raise RuntimeError("OPENAI_API_KEY is set but the 'openai' package is not installed") from e
+        _client = AsyncOpenAI(api_key=settings.openai_api_key, max_retries=2, timeout=60.0)
+    return _client
+
 
 async def llm_summarize(prompt: str, *, model: str = "gpt-4o-mini") -> str:
     if not settings.openai_api_key:
         raise RuntimeError("OPENAI_API_KEY is required for LLM summarization")
 
-    try:
-        from openai import AsyncOpenAI  # type: ignore
-    except Exception as e:
-        raise RuntimeError("OPENAI_API_KEY is set but the 'openai' package is not installed") from e
-
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
-
-    # Minimal, stable interface: use chat.completions.
-    resp = await client.chat.completions.create(
-        model=model,
-        messages=[
-            {"role": "system", "content": "You are a concise assistant that produces structured outputs."},
-            {"role": "user", "content": prompt},
-        ],
-        temperature=0.2,
-    )
+    client = _get_client()
+    from openai import RateLimitError  # type: ignore
+
+    # Bounded concurrency + exponential backoff with jitter: parallel map
+    # steps fan out through here, so a burst of 429s degrades to a brief
+    # queue instead of cascading failures. (The client's own max_retries
+    # handles transient transport errors; this loop handles rate limits.)
+    async with _get_sem():
+        for attempt in range(6):
+            try:
+                # Minimal, stable interface: use chat.completions.
+                resp = await client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "You are a concise assistant that produces structured outputs.",
+                        },
+                        {"role": "user", "content": prompt},
+                    ],
+                    temperature=0.2,
+                )
+                break
+            except RateLimitError:
+                if attempt == 5:
+                    raise
+                await asyncio.sleep(random.uniform(1.0, min(30.0, 2.0 ** (attempt + 1))))
 
     return (resp.choices[0].message.content or "").strip()
@@ -1,40 +1,73 @@
 """Repo events router — ingest + vector search for commits, PRs, releases from GitHub."""
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import select
+from fastapi import APIRouter, BackgroundTasks, Depends
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import get_db as get_session
+from core.database import async_session, get_db as get_session, set_ef_search
 from models.repo_event import RepoEvent
 from services.auth import require_api_key
-from services.embeddings import embed_texts
+from services.embeddings import embed_one, embed_texts
 from services.schemas import RepoEventCreate, RepoEventOut, RepoEventQuery
 
 router = APIRouter(prefix="/repo-events", tags=["repo-events"], dependencies=[Depends(require_api_key)])
 
+# Exactly the columns RepoEventOut serializes — search responses skip the
+# embedding vector and diff_summary instead of hydrating whole entities.
+_REPO_EVENT_COLS = (
+    RepoEvent.id,
+    RepoEvent.event_type,
+    RepoEvent.repo,
+    RepoEvent.project,
+    RepoEvent.ref,
+    RepoEvent.author,
+    RepoEvent.title,
+    RepoEvent.body,
+    RepoEvent.url,
+    RepoEvent.event_at,
+    RepoEvent.created_at,
+)
+
+
+async def _embed_repo_event(event_id: str, embed_text: str) -> None:
+    """Background step: embed after the response went out, on a fresh session."""
+    try:
+        emb = await embed_one(embed_text)
+        async with async_session() as session:
+            await session.execute(update(RepoEvent).where(RepoEvent.id == event_id).values(embedding=emb))
+            await session.commit()
+    except Exception:
+        pass  # row stays unembedded; search filters on embedding IS NOT NULL
+
 
 @router.post("", response_model=RepoEventOut, status_code=201)
-async def create_repo_event(req: RepoEventCreate, db: AsyncSession = Depends(get_session)):
-    # Generate embedding from title + body
-    embed_text = f"{req.title}\n{req.body or ''}"
-    embeddings = await embed_texts([embed_text])
-
-    event = RepoEvent(
-        event_type=req.event_type,
-        repo=req.repo,
-        project=req.project,
-        ref=req.ref,
-        title=req.title,
-        body=req.body,
-        diff_summary=req.diff_summary,
-        author=req.author,
-        url=req.url,
-        event_at=req.event_at,
-        embedding=embeddings[0],
+async def create_repo_event(
+    req: RepoEventCreate, background: BackgroundTasks, db: AsyncSession = Depends(get_session)
+):
+    # INSERT ... RETURNING hands back the row (server defaults included) in
+    # the same round-trip, so no post-commit refresh SELECT. The embedding is
+    # deferred to a background task, so response latency is the DB write only;
+    # until it lands the row just isn't visible to similarity search.
+    stmt = (
+        insert(RepoEvent)
+        .values(
+            event_type=req.event_type,
+            repo=req.repo,
+            project=req.project,
+            ref=req.ref,
+            title=req.title,
+            body=req.body,
+            diff_summary=req.diff_summary,
+            author=req.author,
+            url=req.url,
+            event_at=req.event_at,
+            embedding=None,
+        )
+        .returning(RepoEvent)
     )
-    db.add(event)
+    event = (await db.execute(select(RepoEvent).from_statement(stmt))).scalar_one()
     await db.commit()
-    await db.refresh(event)
+    background.add_task(_embed_repo_event, event.id, f"{req.title}\n{req.body or ''}")
     return event
 
 
@@ -111,8 +144,9 @@ async def github_webhook(payload: dict, db: AsyncSession = Depends(get_session))
         except Exception:
             pass  # proceed without embeddings if embedding fails
 
-        for evt in event_objects:
-            db.add(evt)
+        # One add_all + commit: SQLAlchemy 2.0's insertmanyvalues folds these
+        # into a single batched INSERT, so a 100-commit push is one round-trip.
+        db.add_all(event_objects)
         await db.commit()
         events_created = event_objects
 
@@ -124,7 +158,7 @@ async def search_repo_events(req: RepoEventQuery, db: AsyncSession = Depends(get
     """Search repo events — vector similarity when query provided, otherwise filtered list."""
     if req.query:
         q_emb = (await embed_texts([req.query]))[0]
-        stmt = select(RepoEvent).where(RepoEvent.embedding.is_not(None))
+        stmt = select(*_REPO_EVENT_COLS).where(RepoEvent.embedding.is_not(None))
 
         if req.repo:
             stmt = stmt.where(RepoEvent.repo == req.repo)
@@ -134,8 +168,9 @@ async def search_repo_events(req: RepoEventQuery, db: AsyncSession = Depends(get
             stmt = stmt.where(RepoEvent.event_type == req.event_type)
 
         stmt = stmt.order_by(RepoEvent.embedding.op("<->")(q_emb)).limit(req.k)
+        await set_ef_search(db, req.k)
     else:
-        stmt = select(RepoEvent).order_by(RepoEvent.event_at.desc()).limit(req.k)
+        stmt = select(*_REPO_EVENT_COLS).order_by(RepoEvent.event_at.desc()).limit(req.k)
         if req.repo:
             stmt = stmt.where(RepoEvent.repo == req.repo)
         if req.project:
@@ -144,4 +179,4 @@ async def search_repo_events(req: RepoEventQuery, db: AsyncSession = Depends(get
             stmt = stmt.where(RepoEvent.event_type == req.event_type)
 
     result = await db.execute(stmt)
-    return result.scalars().all()
+    return result.mappings().all()
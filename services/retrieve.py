@@ -3,12 +3,16 @@
 This is the single endpoint Atlas's brain calls before every task to get relevant context.
 """
 
-from fastapi import APIRouter, Depends
+import asyncio
+import hashlib
+
+import orjson
+from fastapi import APIRouter, Depends, Request, Response
 from pydantic import BaseModel
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Numeric, cast, func, select, text
 
-from core.database import get_db as get_session
+from core.cache import get_redis
+from core.database import async_session, set_ef_search
 from models.chat import Conversation, Message, KnowledgeEntry, WeeklySummary
 from models.insight import Insight
 from models.task_outcome import TaskOutcome
@@ -32,104 +36,134 @@ class RetrieveRequest(BaseModel):
     repo: str | None = None
 
 
-class RetrieveResponse(BaseModel):
-    messages: list[dict]
-    insights: list[dict]
-    knowledge: list[dict]
-    task_outcomes: list[dict]
-    summaries: list[dict]
-    repo_events: list[dict]
+# Each fetch opens its own session so the six vector scans run concurrently
+# on separate pool connections; endpoint latency is the max of the scans
+# instead of their sum.
 
 
-@router.post("", response_model=RetrieveResponse)
-async def retrieve(req: RetrieveRequest, db: AsyncSession = Depends(get_session)):
-    """Single-call retrieval across all Context layers. Returns the most relevant
-    items from each table, ranked by vector similarity to the query."""
 
-    q_emb = (await embed_texts([req.query]))[0]
+async def _tune(db, k_total: int) -> None:
+    """Per-connection knobs: widen the HNSW beam for the largest k in the
+    request and cap runaway scans so one bad query can't hold a pool slot."""
+    await set_ef_search(db, k_total)
+    await db.execute(text("SET LOCAL statement_timeout = '2s'"))
+
 
-    # --- Messages ---
-    msg_stmt = select(
-        Message.id, Message.conversation_id, Message.role, Message.content,
-        (1.0 / (1.0 + Message.embedding.op("<->")(q_emb))).label("score"),
+async def _fetch_messages(req: RetrieveRequest, q_emb, k_total: int) -> list[dict]:
+    # One distance expression shared by score and ORDER BY — binds the query
+    # vector as a single parameter.
+    dist = Message.embedding.op("<->")(q_emb).label("dist")
+    # Round server-side: four decimals is plenty for ranking display, and the
+    # wire carries a short numeric instead of a 17-digit float.
+    score = func.round(cast(1.0 / (1.0 + dist), Numeric), 4).label("score")
+    stmt = select(
+        Message.id, Message.conversation_id, Message.role, Message.content, score,
     ).where(Message.embedding.is_not(None))
 
     if req.project is not None:
         if req.include_general:
-            msg_stmt = msg_stmt.join(Conversation, Conversation.id == Message.conversation_id).where(
+            stmt = stmt.join(Conversation, Conversation.id == Message.conversation_id).where(
                 (Conversation.project == req.project) | (Conversation.project.is_(None))
             )
         else:
-            msg_stmt = msg_stmt.join(Conversation, Conversation.id == Message.conversation_id).where(
+            stmt = stmt.join(Conversation, Conversation.id == Message.conversation_id).where(
                 Conversation.project == req.project
             )
 
-    msg_stmt = msg_stmt.order_by(Message.embedding.op("<->")(q_emb)).limit(req.k_messages)
-    msg_rows = (await db.execute(msg_stmt)).all()
-    messages = [
-        {"conversation_id": str(r.conversation_id), "role": r.role, "content": r.content, "score": float(r.score)}
-        for r in msg_rows
+    stmt = stmt.order_by(dist).limit(req.k_messages)
+    async with async_session() as db:
+        await _tune(db, k_total)
+        rows = (await db.execute(stmt)).all()
+    return [
+        # orjson serializes UUID natively — no per-row str() call.
+        {"conversation_id": r.conversation_id, "role": r.role, "content": r.content, "score": float(r.score)}
+        for r in rows
     ]
 
-    # --- Insights ---
-    ins_stmt = select(Insight).where(Insight.embedding.is_not(None))
-    if req.project:
-        if req.include_general:
-            ins_stmt = ins_stmt.where((Insight.project == req.project) | (Insight.project.is_(None)))
-        else:
-            ins_stmt = ins_stmt.where(Insight.project == req.project)
-    ins_stmt = ins_stmt.order_by(Insight.embedding.op("<->")(q_emb)).limit(req.k_insights)
-    ins_rows = (await db.execute(ins_stmt)).scalars().all()
-    insights = [
-        {"type": i.type, "title": i.title, "content": i.content, "project": i.project}
-        for i in ins_rows
+
+async def _knn(cols, embedding_col, q_emb, k: int, k_total: int, where=()) -> list:
+    """Generic nearest-neighbour fetch: project `cols`, filter to embedded rows
+    (plus any extra predicates), order by distance to q_emb, take k. One shape
+    means the expression tree hits SQLAlchemy's compiled-statement cache
+    instead of recompiling five variants per request."""
+    stmt = (
+        select(*cols)
+        .where(embedding_col.is_not(None), *where)
+        .order_by(embedding_col.op("<->")(q_emb))
+        .limit(k)
+    )
+    async with async_session() as db:
+        await _tune(db, k_total)
+        return (await db.execute(stmt)).all()
+
+
+def _project_filter(col, req: RetrieveRequest) -> list:
+    if not req.project:
+        return []
+    if req.include_general:
+        return [(col == req.project) | (col.is_(None))]
+    return [col == req.project]
+
+
+async def _fetch_insights(req: RetrieveRequest, q_emb, k_total: int) -> list[dict]:
+    rows = await _knn(
+        (Insight.type, Insight.title, Insight.content, Insight.project),
+        Insight.embedding, q_emb, req.k_insights, k_total,
+        where=_project_filter(Insight.project, req),
+    )
+    return [
+        {"type": r.type, "title": r.title, "content": r.content, "project": r.project}
+        for r in rows
     ]
 
-    # --- Knowledge ---
-    kn_stmt = select(KnowledgeEntry).where(KnowledgeEntry.embedding.is_not(None))
-    kn_stmt = kn_stmt.order_by(KnowledgeEntry.embedding.op("<->")(q_emb)).limit(req.k_knowledge)
-    kn_rows = (await db.execute(kn_stmt)).scalars().all()
-    knowledge = [
-        {"category": k.category, "subject": k.subject, "content": k.content, "confidence": k.confidence}
-        for k in kn_rows
+
+async def _fetch_knowledge(req: RetrieveRequest, q_emb, k_total: int) -> list[dict]:
+    rows = await _knn(
+        (KnowledgeEntry.category, KnowledgeEntry.subject, KnowledgeEntry.content, KnowledgeEntry.confidence),
+        KnowledgeEntry.embedding, q_emb, req.k_knowledge, k_total,
+    )
+    return [
+        {"category": r.category, "subject": r.subject, "content": r.content, "confidence": r.confidence}
+        for r in rows
     ]
 
-    # --- Task Outcomes ---
-    to_stmt = select(TaskOutcome).where(TaskOutcome.embedding.is_not(None))
-    if req.project:
-        if req.include_general:
-            to_stmt = to_stmt.where((TaskOutcome.project == req.project) | (TaskOutcome.project.is_(None)))
-        else:
-            to_stmt = to_stmt.where(TaskOutcome.project == req.project)
-    to_stmt = to_stmt.order_by(TaskOutcome.embedding.op("<->")(q_emb)).limit(req.k_outcomes)
-    to_rows = (await db.execute(to_stmt)).scalars().all()
-    task_outcomes = [
-        {"result": t.result, "task_description": t.task_description, "cause": t.cause,
-         "fix": t.fix, "recommendation": t.recommendation}
-        for t in to_rows
+
+async def _fetch_task_outcomes(req: RetrieveRequest, q_emb, k_total: int) -> list[dict]:
+    rows = await _knn(
+        (TaskOutcome.result, TaskOutcome.task_description, TaskOutcome.cause,
+         TaskOutcome.fix, TaskOutcome.recommendation),
+        TaskOutcome.embedding, q_emb, req.k_outcomes, k_total,
+        where=_project_filter(TaskOutcome.project, req),
+    )
+    return [
+        {"result": r.result, "task_description": r.task_description, "cause": r.cause,
+         "fix": r.fix, "recommendation": r.recommendation}
+        for r in rows
     ]
 
-    # --- Weekly Summaries ---
-    ws_stmt = select(WeeklySummary).where(WeeklySummary.embedding.is_not(None))
-    ws_stmt = ws_stmt.order_by(WeeklySummary.embedding.op("<->")(q_emb)).limit(req.k_summaries)
-    ws_rows = (await db.execute(ws_stmt)).scalars().all()
-    summaries = [
-        {"week_start": str(s.week_start), "week_end": str(s.week_end), "summary": s.summary}
-        for s in ws_rows
+
+async def _fetch_summaries(req: RetrieveRequest, q_emb, k_total: int) -> list[dict]:
+    rows = await _knn(
+        (WeeklySummary.week_start, WeeklySummary.week_end, WeeklySummary.summary),
+        WeeklySummary.embedding, q_emb, req.k_summaries, k_total,
+    )
+    return [
+        {"week_start": r.week_start, "week_end": r.week_end, "summary": r.summary}
+        for r in rows
     ]
 
-    # --- Repo Events ---
-    re_stmt = select(RepoEvent).where(RepoEvent.embedding.is_not(None))
+
+async def _fetch_repo_events(req: RetrieveRequest, q_emb, k_total: int) -> list[dict]:
+    where = _project_filter(RepoEvent.project, req)
     if req.repo:
-        re_stmt = re_stmt.where(RepoEvent.repo == req.repo)
-    if req.project:
-        if req.include_general:
-            re_stmt = re_stmt.where((RepoEvent.project == req.project) | (RepoEvent.project.is_(None)))
-        else:
-            re_stmt = re_stmt.where(RepoEvent.project == req.project)
-    re_stmt = re_stmt.order_by(RepoEvent.embedding.op("<->")(q_emb)).limit(req.k_repo_events)
-    re_rows = (await db.execute(re_stmt)).scalars().all()
-    repo_events = [
+        where.append(RepoEvent.repo == req.repo)
+    rows = await _knn(
+        (RepoEvent.event_type, RepoEvent.repo, RepoEvent.title, RepoEvent.body, RepoEvent.ref,
+         RepoEvent.author, RepoEvent.url, RepoEvent.event_at, RepoEvent.project),
+        RepoEvent.embedding, q_emb, req.k_repo_events, k_total,
+        where=where,
+    )
+    return [
         {
             "event_type": e.event_type,
             "repo": e.repo,
@@ -138,17 +172,74 @@ async def retrieve(req: RetrieveRequest, db: AsyncSession = Depends(get_session)
             "ref": e.ref,
             "author": e.author,
             "url": e.url,
-            "event_at": str(e.event_at),
+            "event_at": e.event_at,
             "project": e.project,
         }
-        for e in re_rows
+        for e in rows
     ]
 
-    return RetrieveResponse(
-        messages=messages,
-        insights=insights,
-        knowledge=knowledge,
-        task_outcomes=task_outcomes,
-        summaries=summaries,
-        repo_events=repo_events,
+
+_CACHE_TTL = 60  # seconds — agents re-ask the same question in short bursts
+
+
+def _cache_key(req: RetrieveRequest) -> str:
+    canonical = orjson.dumps(req.model_dump(), option=orjson.OPT_SORT_KEYS)
+    return "retrieve:" + hashlib.sha256(canonical).hexdigest()
+
+
+# No response_model: the payload is dicts built by the fetches above, and a
+# response_model would make FastAPI re-validate them on the way out — exactly
+# the cost this endpoint avoids. orjson renders the dict once, serving both
+# the response body and the cache entry.
+@router.post("")
+async def retrieve(req: RetrieveRequest, request: Request):
+    """Single-call retrieval across all Context layers. Returns the most relevant
+    items from each table, ranked by vector similarity to the query."""
+
+    # Exact-request cache: a hit skips the embedding call and all six vector
+    # scans. Send x-no-cache: 1 to bypass. Best-effort, like the embedding
+    # Redis tier — cache trouble must never fail retrieval.
+    redis = get_redis()
+    key = None
+    if redis is not None and request.headers.get("x-no-cache") != "1":
+        key = _cache_key(req)
+        try:
+            cached = await redis.get(key)
+        except Exception:
+            cached = None
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+
+    q_emb = (await embed_texts([req.query]))[0]
+    k_total = max(
+        req.k_messages, req.k_insights, req.k_knowledge,
+        req.k_outcomes, req.k_summaries, req.k_repo_events,
+    )
+
+    messages, insights, knowledge, task_outcomes, summaries, repo_events = await asyncio.gather(
+        _fetch_messages(req, q_emb, k_total),
+        _fetch_insights(req, q_emb, k_total),
+        _fetch_knowledge(req, q_emb, k_total),
+        _fetch_task_outcomes(req, q_emb, k_total),
+        _fetch_summaries(req, q_emb, k_total),
+        _fetch_repo_events(req, q_emb, k_total),
     )
+
+    body = orjson.dumps(
+        {
+            "messages": messages,
+            "insights": insights,
+            "knowledge": knowledge,
+            "task_outcomes": task_outcomes,
+            "summaries": summaries,
+            "repo_events": repo_events,
+        }
+    )
+
+    if key is not None:
+        try:
+            await redis.set(key, body, ex=_CACHE_TTL)
+        except Exception:
+            pass
+
+    return Response(content=body, media_type="application/json")
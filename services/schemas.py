@@ -1,11 +1,12 @@
 import uuid
 from datetime import datetime
+from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel
 
 
 class MessageIn(BaseModel):
-    role: str = Field(..., pattern="^(user|assistant|system)$")
+    role: Literal["user", "assistant", "system"]
     content: str
 
 
@@ -38,22 +39,10 @@ class ProjectReassignRequest(BaseModel):
     project: str | None = None
 
 
-class SearchHit(BaseModel):
-    conversation_id: uuid.UUID
-    message_id: uuid.UUID
-    role: str
-    content: str
-    score: float
-
-
-class SearchResponse(BaseModel):
-    hits: list[SearchHit]
-
-
 # --- Knowledge ---
 
 class KnowledgeCreate(BaseModel):
-    category: str = Field(..., pattern="^(preference|pattern|entity|insight)$")
+    category: Literal["preference", "pattern", "entity", "insight"]
     subject: str
     content: str
     confidence: float = 1.0
@@ -111,7 +100,7 @@ class WeeklySummaryQuery(BaseModel):
 # --- Insights ---
 
 class InsightCreate(BaseModel):
-    type: str = Field(..., pattern="^(lesson|mistake|retrospective|playbook|idea)$")
+    type: Literal["lesson", "mistake", "retrospective", "playbook", "idea"]
     project: str | None = None
     title: str
     content: str
@@ -145,7 +134,7 @@ class InsightSearch(BaseModel):
 # --- Repo Events ---
 
 class RepoEventCreate(BaseModel):
-    event_type: str = Field(..., pattern="^(commit|pr|release|tag)$")
+    event_type: Literal["commit", "pr", "release", "tag"]
     repo: str
     project: str | None = None
     ref: str | None = None
@@ -186,7 +175,7 @@ class RepoEventQuery(BaseModel):
 
 class TaskOutcomeCreate(BaseModel):
     project: str | None = None
-    result: str = Field(..., pattern="^(success|failure|partial)$")
+    result: Literal["success", "failure", "partial"]
     task_description: str
     cause: str | None = None
     fix: str | None = None
@@ -1,27 +1,37 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy import Select, select
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import Numeric, Select, cast, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import get_db
+from core.database import get_db, set_ef_search
 from models.chat import Message
 from services.auth import require_api_key
 from services.embeddings import embed_texts
-from services.schemas import SearchRequest, SearchResponse
+from services.schemas import SearchRequest
 
 router = APIRouter(dependencies=[Depends(require_api_key)])
 
 
-@router.post("/messages", response_model=SearchResponse)
+# No response_model: the hits are rows we shaped ourselves, and a response
+# model would re-validate them during serialization. ORJSONResponse here
+# (rather than a returned dict) also skips FastAPI's jsonable_encoder pass
+# — orjson handles the UUID columns natively.
+@router.post("/messages")
 async def search_messages(payload: SearchRequest, db: AsyncSession = Depends(get_db)):
     q_emb = (await embed_texts([payload.query]))[0]
 
+    # Build the distance expression once so the 6 KB query vector binds a
+    # single parameter shared by the score column and the ORDER BY.
+    dist = Message.embedding.op("<->")(q_emb).label("dist")
+
     stmt: Select = select(
         Message.id,
         Message.conversation_id,
         Message.role,
         Message.content,
-        # pgvector distance: smaller is closer. We'll convert to a similarity-ish score.
-        (1.0 / (1.0 + (Message.embedding.op("<->")(q_emb)))).label("score"),
+        # pgvector distance: smaller is closer. We'll convert to a similarity-ish
+        # score, rounded server-side to keep the wire value small.
+        func.round(cast(1.0 / (1.0 + dist), Numeric), 4).label("score"),
     ).where(Message.embedding.is_not(None))
 
     # project lives on conversation; simplest v1 join
@@ -37,18 +47,22 @@ async def search_messages(payload: SearchRequest, db: AsyncSession = Depends(get
                 Conversation.project == payload.project
             )
 
-    stmt = stmt.order_by(Message.embedding.op("<->")(q_emb)).limit(payload.k)
+    stmt = stmt.order_by(dist).limit(payload.k)
 
+    # Per-query recall/latency knob for the HNSW scan.
+    await set_ef_search(db, payload.k)
     rows = (await db.execute(stmt)).all()
-    return SearchResponse(
-        hits=[
-            {
-                "conversation_id": r.conversation_id,
-                "message_id": r.id,
-                "role": r.role,
-                "content": r.content,
-                "score": float(r.score),
-            }
-            for r in rows
-        ]
+    return ORJSONResponse(
+        {
+            "hits": [
+                {
+                    "conversation_id": r.conversation_id,
+                    "message_id": r.id,
+                    "role": r.role,
+                    "content": r.content,
+                    "score": float(r.score),
+                }
+                for r in rows
+            ]
+        }
     )
@@ -1,12 +1,14 @@
 """Weekly summaries router — store/generate periodic compressed summaries."""
 
+import re
 from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from sqlalchemy import func, literal, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import get_db as get_session
+from core.database import get_db as get_session, set_ef_search
 from models.chat import WeeklySummary
 from services.auth import require_api_key
 from services.embeddings import embed_texts
@@ -14,6 +16,9 @@ from services.schemas import WeeklySummaryCreate, WeeklySummaryOut, WeeklySummar
 
 router = APIRouter(prefix="/weekly-summaries", tags=["weekly-summaries"], dependencies=[Depends(require_api_key)])
 
+# Extracts both header fields from the LLM output in one multiline pass.
+_HEADER_PAT = re.compile(r"^- (projects active|ideas mentioned):\s*(.*)$", re.I | re.M)
+
 
 @router.post("", response_model=WeeklySummaryOut, status_code=201)
 async def create_weekly_summary(req: WeeklySummaryCreate, db: AsyncSession = Depends(get_session)):
@@ -54,6 +59,7 @@ async def search_weekly_summaries(req: WeeklySummaryQuery, db: AsyncSession = De
         q_emb = (await embed_texts([req.query]))[0]
         stmt = select(WeeklySummary).where(WeeklySummary.embedding.is_not(None))
         stmt = stmt.order_by(WeeklySummary.embedding.op("<->")(q_emb)).limit(req.k)
+        await set_ef_search(db, req.k)
     else:
         stmt = select(WeeklySummary).order_by(WeeklySummary.week_start.desc()).limit(req.k)
 
@@ -79,18 +85,32 @@ async def generate_weekly_summary(
     from models.chat import Conversation, Message
     from services.llm import llm_summarize
 
-    stmt = (
-        select(Message.role, Message.content, Message.created_at, Conversation.project)
+    # Aggregate the transcript server-side: Postgres formats and joins the
+    # lines with string_agg, so one scalar comes back instead of 2000 rows
+    # re-assembled in Python.
+    line = func.concat(
+        "[",
+        func.to_char(Message.created_at, 'YYYY-MM-DD"T"HH24:MI:SS'),
+        "] (",
+        func.coalesce(Conversation.project, "general"),
+        ") ",
+        Message.role,
+        ": ",
+        Message.content,
+    )
+    window = (
+        select(line.label("line"), Message.created_at.label("created_at"))
         .join(Conversation, Conversation.id == Message.conversation_id)
         .where(Message.created_at >= week_start)
         .order_by(Message.created_at.asc())
         .limit(2000)
+        .subquery()
     )
-    rows = (await db.execute(stmt)).all()
-
-    transcript = "\n".join(
-        [f"[{r.created_at.isoformat()}] ({r.project or 'general'}) {r.role}: {r.content}" for r in rows]
-    )
+    transcript = (
+        await db.execute(
+            select(func.string_agg(window.c.line, aggregate_order_by(literal("\n"), window.c.created_at)))
+        )
+    ).scalar() or ""
 
     prompt = (
         "Create a weekly summary of Atlas activity from the transcript.\n\n"
@@ -105,13 +125,9 @@ async def generate_weekly_summary(
 
     summary_text = await llm_summarize(prompt)
 
-    projects_active = None
-    ideas_mentioned = None
-    for line in summary_text.splitlines():
-        if line.lower().startswith("- projects active:"):
-            projects_active = line.split(":", 1)[1].strip() or None
-        if line.lower().startswith("- ideas mentioned:"):
-            ideas_mentioned = line.split(":", 1)[1].strip() or None
+    fields = {m.group(1).lower(): m.group(2).strip() or None for m in _HEADER_PAT.finditer(summary_text)}
+    projects_active = fields.get("projects active")
+    ideas_mentioned = fields.get("ideas mentioned")
 
     embeddings = await embed_texts([summary_text])
 
@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import get_db as get_session
+from core.database import get_db as get_session, set_ef_search
 from models.task_outcome import TaskOutcome
 from services.auth import require_api_key
 from services.embeddings import embed_texts
@@ -18,14 +18,14 @@ async def create_task_outcome(req: TaskOutcomeCreate, db: AsyncSession = Depends
     tags_list = [t.strip() for t in req.tags.split(",")] if req.tags else []
 
     # Generate embedding from task description + cause + recommendation
-    embed_text = req.task_description
+    parts = [req.task_description]
     if req.cause:
-        embed_text += f"\nCause: {req.cause}"
+        parts.append(f"Cause: {req.cause}")
     if req.fix:
-        embed_text += f"\nFix: {req.fix}"
+        parts.append(f"Fix: {req.fix}")
     if req.recommendation:
-        embed_text += f"\nRecommendation: {req.recommendation}"
-    embeddings = await embed_texts([embed_text])
+        parts.append(f"Recommendation: {req.recommendation}")
+    embeddings = await embed_texts(["\n".join(parts)])
 
     outcome = TaskOutcome(
         project=req.project,
@@ -48,22 +48,23 @@ async def create_task_outcome(req: TaskOutcomeCreate, db: AsyncSession = Depends
 @router.post("/search", response_model=list[TaskOutcomeOut])
 async def search_task_outcomes(req: TaskOutcomeQuery, db: AsyncSession = Depends(get_session)):
     """Search task outcomes — vector similarity when query provided."""
+    # Filters apply identically to both arms; only the ordering differs.
+    stmt = select(TaskOutcome)
+    if req.project:
+        stmt = stmt.where(TaskOutcome.project == req.project)
+    if req.result:
+        stmt = stmt.where(TaskOutcome.result == req.result)
+
     if req.query:
         q_emb = (await embed_texts([req.query]))[0]
-        stmt = select(TaskOutcome).where(TaskOutcome.embedding.is_not(None))
-
-        if req.project:
-            stmt = stmt.where(TaskOutcome.project == req.project)
-        if req.result:
-            stmt = stmt.where(TaskOutcome.result == req.result)
-
-        stmt = stmt.order_by(TaskOutcome.embedding.op("<->")(q_emb)).limit(req.k)
+        stmt = (
+            stmt.where(TaskOutcome.embedding.is_not(None))
+            .order_by(TaskOutcome.embedding.op("<->")(q_emb))
+            .limit(req.k)
+        )
+        await set_ef_search(db, req.k)
     else:
-        stmt = select(TaskOutcome).order_by(TaskOutcome.created_at.desc()).limit(req.k)
-        if req.project:
-            stmt = stmt.where(TaskOutcome.project == req.project)
-        if req.result:
-            stmt = stmt.where(TaskOutcome.result == req.result)
+        stmt = stmt.order_by(TaskOutcome.created_at.desc()).limit(req.k)
 
     result = await db.execute(stmt)
     return result.scalars().all()